@@ -5,6 +5,11 @@ from together import Together
 from typing import List
 
 import time
+import hashlib
+import sqlite3
+import threading
+from array import array
+from functools import lru_cache
 
 import config
 
@@ -126,6 +131,45 @@ def get_embeddings(texts: List[str], model: str) -> List[List[float]]:
     return [outputs.data[i].embedding for i in range(len(texts))]
 
 
+EMBEDDING_CACHE_PATH = "embedding_cache.db"
+# Oldest rows are evicted once the on-disk cache grows past this
+EMBEDDING_CACHE_MAX_ROWS = 10000
+_embeddingCacheDb = None
+_embeddingCacheLock = threading.Lock()
+
+
+def _getEmbeddingCacheDb():
+    global _embeddingCacheDb
+    if _embeddingCacheDb is None:
+        _embeddingCacheDb = sqlite3.connect(EMBEDDING_CACHE_PATH, isolation_level=None, check_same_thread=False)
+        _embeddingCacheDb.execute("PRAGMA journal_mode=WAL")
+        _embeddingCacheDb.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)")
+    return _embeddingCacheDb
+
+
+@lru_cache(maxsize=1024)
+def get_cached_embedding(text: str, model: str) -> tuple:
+    ### Embed a single query text, reusing float32 embeddings persisted by earlier runs
+    key = model + ":" + hashlib.sha1(text.encode()).hexdigest()
+    with _embeddingCacheLock:
+        row = _getEmbeddingCacheDb().execute("SELECT vec FROM embeddings WHERE key = ?", (key,)).fetchone()
+    if row:
+        return tuple(array("f", row[0]))
+
+    embedding = array("f", get_embeddings([text], model=model)[0])
+    with _embeddingCacheLock:
+        db = _getEmbeddingCacheDb()
+        db.execute(
+            "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+            (key, embedding.tobytes())
+        )
+        db.execute(
+            "DELETE FROM embeddings WHERE rowid <= (SELECT MAX(rowid) FROM embeddings) - ?",
+            (EMBEDDING_CACHE_MAX_ROWS,)
+        )
+    return tuple(embedding)
+
+
 def addTxt(chromaClient, collectionName, info, fileName): 
      maxLen = config.maxLen
      overlap = config.overlap
@@ -170,11 +214,15 @@ def addTxt(chromaClient, collectionName, info, fileName):
      print("Added Data : " + collectionName)
 
 
-def fetch_context(chromaClient, message, collectionName="docs", n=3):
+def fetch_context(chromaClient, message, collectionName="docs", n=3, cache=False):
     ### Here we want to fetch any other relevant context from vector DB 
+    ### cache should only be set for messages that repeat, e.g. the thought process query
     try :
         collection = chromaClient.get_collection(collectionName)
-        embedding = get_embeddings([message], model=config.embeddingModel)
+        if cache:
+            embedding = [list(get_cached_embedding(message, config.embeddingModel))]
+        else:
+            embedding = get_embeddings([message], model=config.embeddingModel)
 
         results = collection.query(query_embeddings=embedding, n_results=2)
         docs = results['documents'][0]
@@ -230,6 +278,7 @@ def fetch_history(chromaClient, maxLength=2500, collectionName="pastInteractions
         return ""
 
 
+@lru_cache(maxsize=2048)
 def getTweetResponsePrompt(tweetContent, sender, searchContext):
      prompt = f"""
      You are responding to a tweet from {sender}
@@ -260,7 +309,7 @@ def prepareContext(message, chromaClient,includeHistory=True, includeDocs=True,
           context += fetch_history(chromaClient)
      if includeDocs: 
           try : 
-               docContext = fetch_context(chromaClient, message)
+               docContext = fetch_context(chromaClient, message, cache=True)
                if docContext != "": 
                     context += f"\n<context> The below is information from {collectionName} "
                     context += docContext
@@ -1,6 +1,12 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import orjson
+import ijson
 import time
+import threading
+from collections import deque
 from typing import Optional, Dict, List, Any
 from datetime import datetime
 from urllib.parse import urlencode
@@ -12,9 +18,189 @@ load_dotenv()
 
 import chromadb 
 
+# GraphQL endpoints
+GRAPHQL_URL = "https://twitter.com/i/api/graphql"
+SEARCH_URL = f"{GRAPHQL_URL}/gkjsKepM6gl_HmFWoWKfgg/SearchTimeline"
+USER_BY_SCREEN_NAME_URL = f"{GRAPHQL_URL}/G3KGOASz96M-Qu0nwmGXNg/UserByScreenName"
+FOLLOWERS_URL = f"{GRAPHQL_URL}/rRXFSG5vR6drKr5M37YOTw/Followers"
+CREATE_TWEET_QUERY_ID = "a1p9RWpkYKBjWv_I3WzS-A"
+CREATE_TWEET_URL = f"{GRAPHQL_URL}/{CREATE_TWEET_QUERY_ID}/CreateTweet"
+TWEET_DETAIL_URL = f"{GRAPHQL_URL}/xOhkmRac04YFZmOzU9PJHg/TweetDetail"
+USER_TWEETS_URL = f"{GRAPHQL_URL}/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets"
+
+# Constant parts of each request's variables, merged with the per-call fields
+_SEARCH_VARS_TEMPLATE = {
+    "querySource": "typed_query",
+    "product": "Latest",
+    "includePromotedContent": False,
+    "withDownvotePerspective": False,
+    "withReactionsMetadata": False,
+    "withReactionsPerspective": False
+}
+_USER_BY_SCREEN_NAME_VARS_TEMPLATE = {
+    "withSafetyModeUserFields": True,
+    "withSuperFollowsUserFields": True,
+}
+_FOLLOWERS_VARS_TEMPLATE = {
+    "includePromotedContent": False,
+    "withSuperFollowsUserFields": True,
+    "withDownvotePerspective": False,
+    "withReactionsMetadata": False,
+    "withReactionsPerspective": False,
+    "withSuperFollowsTweetFields": True,
+}
+_TWEET_DETAIL_VARS_TEMPLATE = {
+    "with_rux_injections": False,
+    "includePromotedContent": False,
+    "withCommunity": True,
+    "withQuickPromoteEligibilityTweetFields": True,
+    "withBirdwatchNotes": False,
+    "withVoice": True,
+    "withV2Timeline": True
+}
+_USER_TWEETS_VARS_TEMPLATE = {
+    "includePromotedContent": False,
+    "withQuickPromoteEligibilityTweetFields": True,
+    "withVoice": True,
+    "withV2Timeline": True
+}
+
+# Follower lists change slowly, reuse them for an hour
+FOLLOWERS_CACHE_TTL = 3600
+
+# Read response bodies in large chunks rather than requests' default 10KB
+JSON_CHUNK_SIZE = 65536
+
+# Field toggles are also required for some requests
+_SEARCH_FIELD_TOGGLES_JSON = orjson.dumps({"withArticleRichContentState": False}).decode()
+_USER_BY_SCREEN_NAME_FIELD_TOGGLES_JSON = orjson.dumps({"withAuxiliaryUserLabels": False}).decode()
+
+class RateLimiter:
+    """Thread-safe sliding window limiter allowing max_rate calls per time_period seconds"""
+
+    def __init__(self, max_rate: int, time_period: float):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed, then record it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.time_period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_rate:
+                    self._calls.append(now)
+                    return
+                wait = self.time_period - (now - self._calls[0])
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
 class TwitterClient:
     BASE_URL = "https://twitter.com"
     API_URL = "https://api.twitter.com"
+
+    # Default feature flags required by Twitter, built and encoded once at import time
+    _DEFAULT_FEATURES: Dict[str, bool] = {
+        # Core features
+        "verified_phone_label_enabled": False,
+        "tweetypie_unmention_optimization_enabled": True,
+        "responsive_web_edit_tweet_api_enabled": True,
+        "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+        "view_counts_everywhere_api_enabled": True,
+        "longform_notetweets_consumption_enabled": True,
+        "responsive_web_twitter_article_tweet_consumption_enabled": False,
+        "tweet_awards_web_tipping_enabled": False,
+        "freedom_of_speech_not_reach_fetch_enabled": True,
+        "standardized_nudges_misinfo": True,
+        "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
+        "longform_notetweets_rich_text_read_enabled": True,
+        "longform_notetweets_inline_media_enabled": True,
+        "responsive_web_enhance_cards_enabled": False,
+        "responsive_web_graphql_exclude_directive_enabled": True,
+        "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+        "responsive_web_graphql_timeline_navigation_enabled": True,
+        
+        # Missing required features that caused the error
+        "vibe_api_enabled": False,
+        "responsive_web_text_conversations_enabled": False,
+        "interactive_text_enabled": True,
+        "blue_business_profile_image_shape_enabled": False,
+        
+        # Additional features
+        "c9s_tweet_anatomy_moderator_badge_enabled": True,
+        "rweb_video_timestamps_enabled": True,
+        "responsive_web_media_download_video_enabled": False,
+        "rweb_tipjar_consumption_enabled": True,
+        "articles_preview_enabled": True,
+        "creator_subscriptions_quote_tweet_preview_enabled": True,
+        "communities_web_enable_tweet_community_results_fetch": True,
+        "android_graphql_skip_api_media_color_palette": False,
+        "creator_subscriptions_tweet_preview_api_enabled": True,
+        
+        # Additional conversation and UI features
+        "unified_cards_ad_metadata_container_dynamic_card_content_query_enabled": False
+    }
+    _DEFAULT_FEATURES_JSON = orjson.dumps(_DEFAULT_FEATURES).decode()
+
+    # Default feature flags required by Twitter for user profile lookups
+    _DEFAULT_FEATURES_USER_PROFILE: Dict[str, bool] = {
+        # Core features
+        "verified_phone_label_enabled": False,
+        "tweetypie_unmention_optimization_enabled": True,
+        "responsive_web_edit_tweet_api_enabled": True,
+        "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+        "view_counts_everywhere_api_enabled": True,
+        "longform_notetweets_consumption_enabled": True,
+        "responsive_web_twitter_article_tweet_consumption_enabled": False,
+        "tweet_awards_web_tipping_enabled": False,
+        "freedom_of_speech_not_reach_fetch_enabled": True,
+        "standardized_nudges_misinfo": True,
+        "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
+        "longform_notetweets_rich_text_read_enabled": True,
+        "longform_notetweets_inline_media_enabled": True,
+        "responsive_web_enhance_cards_enabled": False,
+        "responsive_web_graphql_exclude_directive_enabled": True,
+        "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+        "responsive_web_graphql_timeline_navigation_enabled": True,
+        
+        # Additional required features for user profile
+        "hidden_profile_likes_enabled": False,
+        "hidden_profile_subscriptions_enabled": False,
+        "highlights_tweets_tab_ui_enabled": True,
+        "creator_subscriptions_tweet_preview_api_enabled": True,
+        "subscriptions_verification_info_is_identity_verified_enabled": True,
+        "subscriptions_verification_info_verified_since_enabled": True,
+        
+        # Other features
+        "vibe_api_enabled": False,
+        "responsive_web_text_conversations_enabled": False,
+        "interactive_text_enabled": True,
+        "blue_business_profile_image_shape_enabled": False,
+        "c9s_tweet_anatomy_moderator_badge_enabled": True,
+        "rweb_video_timestamps_enabled": True,
+        "responsive_web_media_download_video_enabled": False,
+        "rweb_tipjar_consumption_enabled": True,
+        "articles_preview_enabled": True,
+        "creator_subscriptions_quote_tweet_preview_enabled": True,
+        "communities_web_enable_tweet_community_results_fetch": True,
+        "android_graphql_skip_api_media_color_palette": False,
+        "unified_cards_ad_metadata_container_dynamic_card_content_query_enabled": False
+    }
+    _DEFAULT_FEATURES_USER_PROFILE_JSON = orjson.dumps(_DEFAULT_FEATURES_USER_PROFILE).decode()
+
+    # Shared by every client instance so concurrent searches stay within Twitter's quota
+    _limiter = RateLimiter(max_rate=15, time_period=60)
+    # (username, max_followers) -> (fetched_at, followers), shared across instances
+    _followers_cache: Dict[tuple, tuple] = {}
     
     def __init__(
         self,
@@ -30,15 +216,36 @@ class TwitterClient:
         self.email = email
         self.poll_interval = poll_interval
         self.session = requests.Session()
+        # Share one keep-alive pool across concurrent requests and retry transient failures.
+        # POST is left out of allowed_methods as CreateTweet is not idempotent, and 429 is
+        # left out of status_forcelist so retries don't spend rate limited quota.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            pool_block=False,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[500, 502, 503, 504],
+                allowed_methods=["GET"],
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
         self.bearer_token = "AAAAAAAAAAAAAAAAAAAAAFQODgEAAAAAVHTp76lzh3rFzcHbmHVvQxYYpTw%3DckAlMINMjmCwxUcaXbAN4XqJVdgMJaHqNOFgPMK0zN1qLqLQCF"
         self.chroma_client = chroma_client
+        # CSRF token sent with each GET, cleared on 401/403 so it's re-read
+        self._csrf = None
         
         # Set up default headers
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Authorization": f"Bearer {self.bearer_token}",
             "Content-Type": "application/json",
-            "Accept": "*/*"
+            "Accept": "*/*",
+            "Connection": "keep-alive",
+            # Includes br when brotli is installed so urllib3 can decode it
+            "Accept-Encoding": ACCEPT_ENCODING
         })
         
         # Set up cookies directly from environment variables
@@ -55,53 +262,6 @@ class TwitterClient:
             # Debug print
             print("Session cookies after setup:", self.session.cookies.get_dict())
 
-    def _get_default_features(self) -> Dict[str, bool]:
-        """Get default feature flags required by Twitter"""
-        return {
-            # Core features
-            "verified_phone_label_enabled": False,
-            "tweetypie_unmention_optimization_enabled": True,
-            "responsive_web_edit_tweet_api_enabled": True,
-            "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
-            "view_counts_everywhere_api_enabled": True,
-            "longform_notetweets_consumption_enabled": True,
-            "responsive_web_twitter_article_tweet_consumption_enabled": False,
-            "tweet_awards_web_tipping_enabled": False,
-            "freedom_of_speech_not_reach_fetch_enabled": True,
-            "standardized_nudges_misinfo": True,
-            "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
-            "longform_notetweets_rich_text_read_enabled": True,
-            "longform_notetweets_inline_media_enabled": True,
-            "responsive_web_enhance_cards_enabled": False,
-            "responsive_web_graphql_exclude_directive_enabled": True,
-            "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
-            "responsive_web_graphql_timeline_navigation_enabled": True,
-            
-            # Missing required features that caused the error
-            "vibe_api_enabled": False,
-            "responsive_web_text_conversations_enabled": False,
-            "interactive_text_enabled": True,
-            "blue_business_profile_image_shape_enabled": False,
-            
-            # Additional features
-            "c9s_tweet_anatomy_moderator_badge_enabled": True,
-            "rweb_video_timestamps_enabled": True,
-            "responsive_web_media_download_video_enabled": False,
-            "rweb_tipjar_consumption_enabled": True,
-            "articles_preview_enabled": True,
-            "creator_subscriptions_quote_tweet_preview_enabled": True,
-            "communities_web_enable_tweet_community_results_fetch": True,
-            "android_graphql_skip_api_media_color_palette": False,
-            "creator_subscriptions_tweet_preview_api_enabled": True,
-            
-            # Additional conversation and UI features
-            "responsive_web_enhance_cards_enabled": False,
-            "unified_cards_ad_metadata_container_dynamic_card_content_query_enabled": False,
-            "responsive_web_twitter_article_tweet_consumption_enabled": False,
-            "longform_notetweets_rich_text_read_enabled": True,
-            "responsive_web_graphql_timeline_navigation_enabled": True
-        }
-            
     def _setup_cookies(self, cookies_str: str) -> None:
         """Set up session cookies from a cookie string"""
         try:
@@ -109,7 +269,7 @@ class TwitterClient:
             cookies_str = cookies_str.strip("'")
             
             # Parse the JSON string
-            cookie_list = json.loads(cookies_str)
+            cookie_list = orjson.loads(cookies_str)
             
             # Debug print
             print("Parsed cookies:", cookie_list)
@@ -125,7 +285,7 @@ class TwitterClient:
             # Debug print after setting cookies
             print("Session cookies after setup:", self.session.cookies.get_dict())
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error parsing cookies: {e}")
             print(f"Cookie string received: {cookies_str}")
             # Handle raw cookie string format as fallback
@@ -138,93 +298,98 @@ class TwitterClient:
         """Get CSRF token from cookies"""
         return self.session.cookies.get("ct0", domain=".twitter.com")
 
-    def _update_headers_with_csrf(self) -> None:
-        """Update headers with CSRF token"""
-        csrf_token = self.get_csrf_token()
-        if csrf_token:
-            self.session.headers.update({
-                "x-csrf-token": csrf_token,
-            })
+    def _ensure_csrf(self) -> None:
+        """Read the CSRF token from cookies if it isn't cached, _get sends it with each request"""
+        if not self._csrf:
+            self._csrf = self.get_csrf_token()
+
+    def _check_auth(self, response: requests.Response) -> None:
+        """Drop the cached CSRF token if Twitter rejected the request"""
+        if response.status_code in (401, 403):
+            self._csrf = None
+
+
 
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Rate limited GET against the GraphQL API"""
+        # Passed per request rather than set on the session, whose headers
+        # concurrent searches are reading
+        if self._csrf:
+            kwargs["headers"] = {"x-csrf-token": self._csrf, **(kwargs.get("headers") or {})}
+        with self._limiter:
+            response = self.session.get(url, **kwargs)
+        self._check_auth(response)
+        return response
 
+    @staticmethod
+    def _read_json(response: requests.Response) -> Any:
+        """Decode a streamed JSON response body"""
+        return orjson.loads(b"".join(response.iter_content(JSON_CHUNK_SIZE)))
 
     def search_tweets(self, query: str, max_tweets: int = 20) -> List[Dict]:
         """
         Search for tweets using Twitter's search API
         """
-        self._update_headers_with_csrf()
+        self._ensure_csrf()
         
-        variables = {
-            "rawQuery": query,
-            "count": min(max_tweets, 40),
-            "querySource": "typed_query",
-            "product": "Latest",
-            "includePromotedContent": False,
-            "withDownvotePerspective": False,
-            "withReactionsMetadata": False,
-            "withReactionsPerspective": False
-        }
-
-        features = self._get_default_features()
-        
-        # Field toggles are also required for some requests
-        field_toggles = {
-            "withArticleRichContentState": False
-        }
+        variables = {**_SEARCH_VARS_TEMPLATE, "rawQuery": query, "count": min(max_tweets, 40)}
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(features),
-            "fieldToggles": json.dumps(field_toggles)
+            "variables": orjson.dumps(variables).decode(),
+            "features": self._DEFAULT_FEATURES_JSON,
+            "fieldToggles": _SEARCH_FIELD_TOGGLES_JSON
         }
 
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/i/api/graphql/gkjsKepM6gl_HmFWoWKfgg/SearchTimeline",
-                params=params
-            )
-            
-            if response.status_code != 200:
-                print(f"Search request failed: {response.text}")
-                return []
-
-            data = response.json()
-            tweets = []
-            
-            # Navigate through the response structure
-            instructions = data.get('data', {}).get('search_by_raw_query', {}).get('search_timeline', {}).get('timeline', {}).get('instructions', [])
-            
-            for instruction in instructions:
-                if instruction.get('type') == 'TimelineAddEntries':
-                    entries = instruction.get('entries', [])
-                    for entry in entries:
-                        if not entry.get('entryId', '').startswith('tweet-'):
-                            continue
-                            
-                        result = entry.get('content', {}).get('itemContent', {}).get('tweet_results', {}).get('result', {})
-                        if not result:
-                            continue
-
-                        legacy = result.get('legacy', {})
-                        user_result = result.get('core', {}).get('user_results', {}).get('result', {})
-                        user_legacy = user_result.get('legacy', {})
-
-                        if not legacy or not user_legacy:
-                            continue
-
-                        tweet = {
-                            'id': legacy.get('id_str'),
-                            'text': legacy.get('full_text'),
-                            'username': user_legacy.get('screen_name'),
-                            'name': user_legacy.get('name'),
-                            'user_id': user_legacy.get('id_str'),
-                            'created_at': legacy.get('created_at'),
-                            'conversation_id': legacy.get('conversation_id_str'),
-                            'in_reply_to_status_id': legacy.get('in_reply_to_status_id_str'),
-                            'in_reply_to_user_id': legacy.get('in_reply_to_user_id_str'),
-                        }
+            # Stream the body so only the timeline entries are materialised, not the whole tree
+            with self._get(
+                SEARCH_URL,
+                params=params,
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    print(f"Search request failed: {response.text}")
+                    return []
+
+                # Let urllib3 undo gzip/br before ijson sees the bytes
+                response.raw.decode_content = True
+                tweets = []
+                
+                # Only TimelineAddEntries instructions carry an entries array
+                entries = ijson.items(
+                    response.raw,
+                    'data.search_by_raw_query.search_timeline.timeline.instructions.item.entries.item',
+                    use_float=True
+                )
+                
+                for entry in entries:
+                    if not entry.get('entryId', '').startswith('tweet-'):
+                        continue
                         
-                        tweets.append(tweet)
+                    result = entry.get('content', {}).get('itemContent', {}).get('tweet_results', {}).get('result', {})
+                    if not result:
+                        continue
+
+                    legacy = result.get('legacy', {})
+                    user_result = result.get('core', {}).get('user_results', {}).get('result', {})
+                    user_legacy = user_result.get('legacy', {})
+
+                    if not legacy or not user_legacy:
+                        continue
+
+                    tweet = {
+                        'id': legacy.get('id_str'),
+                        'text': legacy.get('full_text'),
+                        'username': user_legacy.get('screen_name'),
+                        'name': user_legacy.get('name'),
+                        'user_id': user_legacy.get('id_str'),
+                        'created_at': legacy.get('created_at'),
+                        'conversation_id': legacy.get('conversation_id_str'),
+                        'in_reply_to_status_id': legacy.get('in_reply_to_status_id_str'),
+                        'in_reply_to_user_id': legacy.get('in_reply_to_user_id_str'),
+                    }
+                    
+                    tweets.append(tweet)
 
             return tweets
 
@@ -232,87 +397,32 @@ class TwitterClient:
             print(f"Error during search: {str(e)}")
             return []
 
-    def _get_default_features_user_profile(self) -> Dict[str, bool]:
-        """Get default feature flags required by Twitter"""
-        return {
-            # Core features
-            "verified_phone_label_enabled": False,
-            "tweetypie_unmention_optimization_enabled": True,
-            "responsive_web_edit_tweet_api_enabled": True,
-            "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
-            "view_counts_everywhere_api_enabled": True,
-            "longform_notetweets_consumption_enabled": True,
-            "responsive_web_twitter_article_tweet_consumption_enabled": False,
-            "tweet_awards_web_tipping_enabled": False,
-            "freedom_of_speech_not_reach_fetch_enabled": True,
-            "standardized_nudges_misinfo": True,
-            "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
-            "longform_notetweets_rich_text_read_enabled": True,
-            "longform_notetweets_inline_media_enabled": True,
-            "responsive_web_enhance_cards_enabled": False,
-            "responsive_web_graphql_exclude_directive_enabled": True,
-            "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
-            "responsive_web_graphql_timeline_navigation_enabled": True,
-            
-            # Additional required features for user profile
-            "hidden_profile_likes_enabled": False,
-            "hidden_profile_subscriptions_enabled": False,
-            "highlights_tweets_tab_ui_enabled": True,
-            "creator_subscriptions_tweet_preview_api_enabled": True,
-            "subscriptions_verification_info_is_identity_verified_enabled": True,
-            "subscriptions_verification_info_verified_since_enabled": True,
-            
-            # Other features
-            "vibe_api_enabled": False,
-            "responsive_web_text_conversations_enabled": False,
-            "interactive_text_enabled": True,
-            "blue_business_profile_image_shape_enabled": False,
-            "c9s_tweet_anatomy_moderator_badge_enabled": True,
-            "rweb_video_timestamps_enabled": True,
-            "responsive_web_media_download_video_enabled": False,
-            "rweb_tipjar_consumption_enabled": True,
-            "articles_preview_enabled": True,
-            "creator_subscriptions_quote_tweet_preview_enabled": True,
-            "communities_web_enable_tweet_community_results_fetch": True,
-            "android_graphql_skip_api_media_color_palette": False,
-            "unified_cards_ad_metadata_container_dynamic_card_content_query_enabled": False
-        }
-
     def _get_user_id(self, username: str) -> Optional[str]:
         """
         Get user ID for a given username
         """
-        self._update_headers_with_csrf()
-        
-        variables = {
-            "screen_name": username,
-            "withSafetyModeUserFields": True,
-            "withSuperFollowsUserFields": True,
-        }
-
-        features = self._get_default_features_user_profile()
+        self._ensure_csrf()
         
-        field_toggles = {
-            "withAuxiliaryUserLabels": False
-        }
+        variables = {**_USER_BY_SCREEN_NAME_VARS_TEMPLATE, "screen_name": username}
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(features),
-            "fieldToggles": json.dumps(field_toggles)
+            "variables": orjson.dumps(variables).decode(),
+            "features": self._DEFAULT_FEATURES_USER_PROFILE_JSON,
+            "fieldToggles": _USER_BY_SCREEN_NAME_FIELD_TOGGLES_JSON
         }
 
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/i/api/graphql/G3KGOASz96M-Qu0nwmGXNg/UserByScreenName",
-                params=params
+            response = self._get(
+                USER_BY_SCREEN_NAME_URL,
+                params=params,
+                stream=True
             )
             
             if response.status_code != 200:
                 print(f"Failed to get user ID: {response.text}")
                 return None
 
-            data = response.json()
+            data = self._read_json(response)
             return data.get('data', {}).get('user', {}).get('result', {}).get('rest_id')
         
         except Exception as e:
@@ -330,46 +440,41 @@ class TwitterClient:
         Returns:
             List[Dict]: List of follower objects containing user data
         """
+        cache_key = (username, max_followers)
+        cached = self._followers_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < FOLLOWERS_CACHE_TTL:
+            return cached[1]
+
         # First get the user ID
         user_id = self._get_user_id(username)
         if not user_id:
             print(f"Could not find user ID for username: {username}")
             return []
 
-        self._update_headers_with_csrf()
+        self._ensure_csrf()
         
         # Ensure max_followers doesn't exceed reasonable API limits
         max_followers = min(max_followers, 100)
         
-        variables = {
-            "userId": user_id,
-            "count": max_followers,
-            "includePromotedContent": False,
-            "withSuperFollowsUserFields": True,
-            "withDownvotePerspective": False,
-            "withReactionsMetadata": False,
-            "withReactionsPerspective": False,
-            "withSuperFollowsTweetFields": True,
-        }
-
-        features = self._get_default_features()
+        variables = {**_FOLLOWERS_VARS_TEMPLATE, "userId": user_id, "count": max_followers}
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(features),
+            "variables": orjson.dumps(variables).decode(),
+            "features": self._DEFAULT_FEATURES_JSON,
         }
 
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/i/api/graphql/rRXFSG5vR6drKr5M37YOTw/Followers",
-                params=params
+            response = self._get(
+                FOLLOWERS_URL,
+                params=params,
+                stream=True
             )
             
             if response.status_code != 200:
                 print(f"Followers request failed: {response.text}")
                 return []
 
-            data = response.json()
+            data = self._read_json(response)
             followers = []
             
             # Navigate through the response structure
@@ -410,6 +515,8 @@ class TwitterClient:
                         
                         followers.append(follower)
 
+            if followers:
+                self._followers_cache[cache_key] = (time.monotonic(), followers)
             return followers
         
         except Exception as e:
@@ -426,17 +533,16 @@ class TwitterClient:
             raise Exception(f"Missing required cookies. auth_token: {'present' if auth_token else 'missing'}, "
                            f"ct0: {'present' if csrf_token else 'missing'}")
         
-        self._update_headers_with_csrf()
-        
-        # Update headers with additional required fields
-        self.session.headers.update({
+        # Additional required fields, passed per request rather than set on the session
+        # since replies are sent from several threads sharing it
+        headers = {
             "x-twitter-auth-type": "OAuth2Session",
             "x-twitter-client-language": "en",
             "x-twitter-active-user": "yes",
             "Referer": "https://twitter.com/compose/tweet",
             "Origin": "https://twitter.com",
             "x-csrf-token": csrf_token
-        })
+        }
         
         # Debug output
         # print("\nRequest Details:")
@@ -458,8 +564,8 @@ class TwitterClient:
 
         payload = {
             "variables": variables,
-            "features": self._get_default_features(),
-            "queryId": "a1p9RWpkYKBjWv_I3WzS-A"
+            "features": self._DEFAULT_FEATURES,
+            "queryId": CREATE_TWEET_QUERY_ID
         }
 
         # Check if we have proper authentication
@@ -467,9 +573,11 @@ class TwitterClient:
             raise Exception("No authentication cookies found. Please provide valid cookies.")
 
         response = self.session.post(
-            f"{self.BASE_URL}/i/api/graphql/a1p9RWpkYKBjWv_I3WzS-A/CreateTweet",
-            json=payload
+            CREATE_TWEET_URL,
+            data=orjson.dumps(payload),
+            headers=headers
         )
+        self._check_auth(response)
         
         if response.status_code != 200:
             # Add more detailed error information
@@ -478,62 +586,48 @@ class TwitterClient:
             print(f"Response body: {response.text}")
             raise Exception(f"Failed to send tweet: Status {response.status_code} - {response.text}")
             
-        return response.json()
+        return orjson.loads(response.content)
 
     def get_tweet(self, tweet_id: str) -> dict:
         """Fetch a specific tweet by ID"""
-        self._update_headers_with_csrf()
+        self._ensure_csrf()
         
-        variables = {
-            "focalTweetId": tweet_id,
-            "with_rux_injections": False,
-            "includePromotedContent": False,
-            "withCommunity": True,
-            "withQuickPromoteEligibilityTweetFields": True,
-            "withBirdwatchNotes": False,
-            "withVoice": True,
-            "withV2Timeline": True
-        }
+        variables = {**_TWEET_DETAIL_VARS_TEMPLATE, "focalTweetId": tweet_id}
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(self._get_default_features())
+            "variables": orjson.dumps(variables).decode(),
+            "features": self._DEFAULT_FEATURES_JSON
         }
 
-        response = self.session.get(
-            f"{self.BASE_URL}/i/api/graphql/xOhkmRac04YFZmOzU9PJHg/TweetDetail",
-            params=params
+        response = self._get(
+            TWEET_DETAIL_URL,
+            params=params,
+            stream=True
         )
         
         if response.status_code != 200:
             raise Exception(f"Failed to fetch tweet: {response.text}")
             
-        return response.json()
+        return self._read_json(response)
 
     def get_user_tweets(self, user_id: str, max_tweets: int = 40) -> List[dict]:
         """Fetch tweets from a specific user"""
-        self._update_headers_with_csrf()
+        self._ensure_csrf()
         
-        variables = {
-            "userId": user_id,
-            "count": min(max_tweets, 40),
-            "includePromotedContent": False,
-            "withQuickPromoteEligibilityTweetFields": True,
-            "withVoice": True,
-            "withV2Timeline": True
-        }
+        variables = {**_USER_TWEETS_VARS_TEMPLATE, "userId": user_id, "count": min(max_tweets, 40)}
 
         params = {
-            "variables": json.dumps(variables),
-            "features": json.dumps(self._get_default_features())
+            "variables": orjson.dumps(variables).decode(),
+            "features": self._DEFAULT_FEATURES_JSON
         }
 
-        response = self.session.get(
-            f"{self.BASE_URL}/i/api/graphql/V7H0Ap3_Hh2FyS75OCDO3Q/UserTweets",
-            params=params
+        response = self._get(
+            USER_TWEETS_URL,
+            params=params,
+            stream=True
         )
         
         if response.status_code != 200:
             raise Exception(f"Failed to fetch user tweets: {response.text}")
             
-        return response.json()
\ No newline at end of file
+        return self._read_json(response)
\ No newline at end of file
@@ -1,11 +1,119 @@
-import json
+import orjson
 import time
 from typing import Optional, Dict, List, Any
 from datetime import datetime, timedelta
 import os
 import random
+import math
+import re
+import sqlite3
+import numpy as np
+from operator import itemgetter
 from datetime import timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from helpers import getTweetResponsePrompt
+from chromadb.utils import embedding_functions
+
+STATE_DB_PATH = 'state.db'
+# Shared by every handler in the process, opened on first use
+_state_db = None
+_state_db_lock = threading.Lock()
+
+def _get_state_db() -> sqlite3.Connection:
+    """Open the SQLite state store (WAL mode, autocommit)"""
+    global _state_db
+    if _state_db is None:
+        _state_db = sqlite3.connect(STATE_DB_PATH, isolation_level=None, check_same_thread=False)
+        _state_db.execute("PRAGMA journal_mode=WAL")
+        _state_db.execute("CREATE TABLE IF NOT EXISTS state (k TEXT PRIMARY KEY, v INTEGER)")
+    return _state_db
+
+# Tweets processed concurrently in check_mentions
+REPLY_WORKERS = 4
+# Random delay range (seconds) before each reply is sent
+REPLY_JITTER = (1, 5)
+
+# all-MiniLM-L6-v2, the same model Chroma uses by default for tweet_responses.
+# Loaded once and shared so each handler doesn't reload the model.
+_embedder = None
+
+def get_embedder():
+    global _embedder
+    if _embedder is None:
+        _embedder = embedding_functions.DefaultEmbeddingFunction()
+    return _embedder
+
+# Twitter's created_at format, e.g. "Wed Oct 10 20:19:24 +0000 2018"
+_TWITTER_TS_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+_TWITTER_TS_RE = re.compile(r'^\w{3} (\w{3}) (\d{2}) (\d{2}):(\d{2}):(\d{2}) ([+-]\d{4}) (\d{4})$')
+_MONTHS = {'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+           'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12}
+
+def parse_twitter_timestamp(created_at: str) -> datetime:
+    """Parse a tweet's created_at string without going through strptime"""
+    match = _TWITTER_TS_RE.match(created_at)
+    if not match or match.group(1) not in _MONTHS:
+        return datetime.strptime(created_at, _TWITTER_TS_FORMAT)
+    month, day, hour, minute, second, offset, year = match.groups()
+    if offset == '+0000':
+        tz = timezone.utc
+    else:
+        sign = -1 if offset[0] == '-' else 1
+        tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:])))
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=tz)
+
+# Result sets at least this large are filtered with numpy, below it the overhead isn't worth it
+VECTORIZE_MIN_TWEETS = 512
+
+def follower_weight(follower: Dict) -> float:
+    """Sampling weight for a follower, favouring accounts with a larger audience"""
+    return math.log1p(follower.get('followers_count') or 0) + 1
+
+def select_new_tweets(search_response: List[Dict], last_checked_tweet_id: int) -> List[Dict]:
+    """Return tweets newer than last_checked_tweet_id, oldest first"""
+    if len(search_response) >= VECTORIZE_MIN_TWEETS:
+        # Compare and sort in numpy's C loops for large backfills
+        ids = np.fromiter((int(tweet['id']) for tweet in search_response), dtype=np.int64, count=len(search_response))
+        newer = np.nonzero(ids > last_checked_tweet_id)[0]
+        order = newer[np.argsort(ids[newer], kind='stable')]
+        return [search_response[i] for i in order]
+    # Parse each id once and sort on the parsed value
+    decorated = [(tweet_id, tweet) for tweet in search_response
+                 if (tweet_id := int(tweet['id'])) > last_checked_tweet_id]
+    decorated.sort(key=itemgetter(0))
+    return [tweet for _, tweet in decorated]
+
+class ReplyBudget:
+    """Caps the replies sent by concurrent workers at max_replies
+
+    A worker holds a slot while its reply is in flight. If the reply fails the slot
+    goes to a waiting worker, workers only give up once max_replies have been sent.
+    """
+
+    def __init__(self, max_replies: int):
+        self.max_replies = max_replies
+        self._sent = 0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        """Block until a slot is free, returns False once the budget is spent"""
+        with self._cond:
+            while self._sent < self.max_replies and self._sent + self._in_flight >= self.max_replies:
+                self._cond.wait()
+            if self._sent >= self.max_replies:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, sent: bool) -> None:
+        """Free a slot, counting it against the budget if a reply was sent"""
+        with self._cond:
+            self._in_flight -= 1
+            if sent:
+                self._sent += 1
+            self._cond.notify_all()
 
 class TwitterInteractionHandler:
     def __init__(self, twitter_client, response_generator=None, chroma_client=None, search_terms=[], reply_targets=[], getUserContext=None, fetchContext=None, updateUserContext=None):
@@ -20,22 +128,43 @@ class TwitterInteractionHandler:
         self.getUserContext = getUserContext
         self.updateUserContext = updateUserContext
         self.fetchContext = fetchContext
+        self._resp_col = self.chroma_client.get_or_create_collection("tweet_responses") if self.chroma_client else None
+        self._responded_ids = self.load_responded_tweet_ids()
+        # (original_tweet_id, tweet_content, log_entry) rows waiting for flush_log
+        self._pending_log = []
+        # Guards _responded_ids and _pending_log, which reply workers update concurrently
+        self._lock = threading.Lock()
+
     def load_last_checked_tweet_id(self) -> Optional[int]:
-        """Load the ID of the last checked tweet from file"""
+        """Load the ID of the last checked tweet from the state store"""
+        with _state_db_lock:
+            row = _get_state_db().execute("SELECT v FROM state WHERE k = 'last_checked_tweet_id'").fetchone()
+        if row:
+            return row[0]
+        # Fall back to the file written by older versions
         try:
-            with open('last_checked_tweet.json', 'r') as f:
-                data = json.load(f)
+            with open('last_checked_tweet.json', 'rb') as f:
+                data = orjson.loads(f.read())
                 return data.get('last_checked_tweet_id')
-        except (FileNotFoundError, json.JSONDecodeError):
+        except (FileNotFoundError, orjson.JSONDecodeError):
             return None
 
     def save_last_checked_tweet_id(self, tweet_id: int):
         """Save the ID of the last checked tweet"""
-        with open('last_checked_tweet.json', 'w') as f:
-            json.dump({'last_checked_tweet_id': tweet_id}, f)
+        with _state_db_lock:
+            _get_state_db().execute(
+                "INSERT OR REPLACE INTO state (k, v) VALUES ('last_checked_tweet_id', ?)",
+                (int(tweet_id),)
+            )
+
+    def load_responded_tweet_ids(self) -> set:
+        """Load the IDs of all tweets we've responded to with a single Chroma query"""
+        if not self._resp_col:
+            return set()
+        return set(self._resp_col.get(include=[])["ids"])
 
     def log_response(self, original_tweet_id: str, response_tweet_id: str, tweet_content: str, response_text: str):
-        """Log when we've responded to a tweet"""
+        """Log when we've responded to a tweet (buffered until flush_log is called)"""
         timestamp = datetime.now().isoformat()
         log_entry = {
             'timestamp': timestamp,
@@ -45,43 +174,51 @@ class TwitterInteractionHandler:
             'response_text': response_text
         }
         
-        if self.chroma_client:
-            client = self.chroma_client
-            collection = client.get_or_create_collection("tweet_responses")
-            collection.add(
-                ids = [original_tweet_id],
-                documents = [tweet_content],
-                metadatas = [log_entry]
-            )
-            print("Successfully logged response to Chroma DB")
+        with self._lock:
+            if self._resp_col:
+                self._pending_log.append((original_tweet_id, tweet_content, log_entry))
 
-            
+            self._responded_ids.add(original_tweet_id)
 
-    def has_responded_to_tweet(self, tweet_id: str) -> bool:
-        """Check if we've already responded to a tweet"""
+    def flush_log(self):
+        """Embed all buffered responses in one batch and write them to Chroma DB in a single add"""
+        if not self._pending_log:
+            return
+        with self._lock:
+            pending, self._pending_log = self._pending_log, []
+        ids, documents, metadatas = (list(column) for column in zip(*pending))
         try:
-            client = self.chroma_client
-            collection = client.get_or_create_collection("tweet_responses")
-            results = collection.get(
-                ids = [tweet_id]
+            embeddings = get_embedder()(documents)
+            self._resp_col.add(
+                ids = ids,
+                documents = documents,
+                embeddings = embeddings,
+                metadatas = metadatas
             )
-            print(results["ids"])
-            if len(results["ids"]) > 0:
-                return True
-            else:
-                return False
+            print(f"Successfully logged {len(ids)} responses to Chroma DB")
+        except Exception as e:
+            print(f"Error logging responses to Chroma DB: {str(e)}")
+            # Keep the rows so the next flush retries them
+            with self._lock:
+                self._pending_log = pending + self._pending_log
 
-        except (FileNotFoundError, json.JSONDecodeError):
-            return False
+    def has_responded_to_tweet(self, tweet_id: str) -> bool:
+        """Check if we've already responded to a tweet"""
+        with self._lock:
+            return tweet_id in self._responded_ids
 
     def default_response(self, tweet_text: str) -> str:
         """Default response if no response generator is provided"""
         return "Hi there! I'm Rice "
 
-    def generate_response(self, tweet_text: str, additionalContext: str = "") -> str:
-        """Generate a response using the provided response generator"""
+    def generate_response(self, tweet_text: str, additionalContext: str = "", fetchedContext: Optional[str] = None) -> str:
+        """Generate a response using the provided response generator
+
+        fetchedContext can be passed in when it has already been fetched (e.g. prefetched in parallel)
+        """
         if self.fetchContext:
-            fetchedContext = self.fetchContext(self.chroma_client, tweet_text)
+            if fetchedContext is None:
+                fetchedContext = self.fetchContext(self.chroma_client, tweet_text)
             print("Fetched context successfully.....")
             # print max 100 characters of fetched context
             if len(fetchedContext) > 100:
@@ -95,28 +232,78 @@ class TwitterInteractionHandler:
             """
         return self.response_generator(tweet_text, additionalContext=additionalContext)
 
-    def check_mentions(self, searchTerm : str, additionalContext: str = "", searchContext: str = "", maxReplies : int = 3):
-        """Check for new mentions and respond to them"""
+    def _process_tweet(self, tweet: Dict, reply_slots: ReplyBudget, ctx_pool: ThreadPoolExecutor, additionalContext: str = "", searchContext: str = "") -> bool:
+        """Generate and send a reply to a single tweet, returns whether a reply was sent"""
+        if not reply_slots.acquire():
+            return False
+
+        tweet_id = tweet['id']
+        try:
+            print(f"Processing tweet {tweet_id} from @{tweet['username']}")
+            tweetContent = tweet['text']
+            print("TWEET CONTENT: ", tweetContent)
+            tweetPrompt = getTweetResponsePrompt(tweetContent, tweet['username'], searchContext=searchContext)
+            # The user context and fetched context lookups are independent, run them side by side
+            userContextFuture = ctx_pool.submit(self.getUserContext, self.chroma_client, tweet['username']) if self.getUserContext else None
+            fetchedContextFuture = ctx_pool.submit(self.fetchContext, self.chroma_client, tweetPrompt) if self.fetchContext else None
+            if userContextFuture : 
+                respondContext = additionalContext + userContextFuture.result()
+            else : 
+                respondContext = additionalContext
+
+            # Generate and send response
+            fetchedContext = fetchedContextFuture.result() if fetchedContextFuture else None
+            response_text = self.generate_response(tweetPrompt, additionalContext=respondContext, fetchedContext=fetchedContext)
+            print("RESPONSE TEXT: ", response_text)
+            # Stagger sends so concurrent workers don't post in a burst
+            time.sleep(random.uniform(*REPLY_JITTER))
+            response = self.client.send_tweet(response_text, tweet_id)
+        except Exception:
+            # Nothing was sent, give the slot back to another tweet
+            reply_slots.release(sent=False)
+            raise
+        reply_slots.release(sent=True)
+
+        interaction = f"""
+        You had the following interaction with {tweet['username']} 
+        {tweet['username']} tweeted : {tweetContent}
+
+        You responded with : {response_text}
+        """
+
+        if self.updateUserContext : 
+            self.updateUserContext(self.chroma_client, tweet['username'], interaction, tweet['username'], additionalContext=additionalContext)
+        
+        # TO DO -> get actual 
+        responseId = "PLACEHOLDER"
+        ### Log Response to Chroma DB
+        self.log_response(original_tweet_id=tweet_id, response_tweet_id=responseId, tweet_content=tweetContent, response_text=response_text)
+        return True
+
+    def check_mentions(self, searchTerm : str, additionalContext: str = "", searchContext: str = "", maxReplies : int = 3, search_response: Optional[List[Dict]] = None):
+        """Check for new mentions and respond to them
+
+        search_response can be passed in when the search has already been run
+        (e.g. fetched concurrently by monitor_mentions)
+        """
         print(f"Checking mentions for {searchTerm}")
         nResponses = 0
         
         try:
-            search_response = self.client.search_tweets(searchTerm, max_tweets=20)
+            if search_response is None:
+                search_response = self.client.search_tweets(searchTerm, max_tweets=20)
             #print(f"Raw search response: {json.dumps(search_response, indent=2)}")
             if not search_response:
                 print("No new mentions found")
                 return
                 
-            tweets = sorted(
-                [tweet for tweet in search_response 
-                 if int(tweet['id']) > (self.last_checked_tweet_id or 0)],
-                key=lambda x: int(x['id'])
-            )
+            tweets = select_new_tweets(search_response, self.last_checked_tweet_id or 0)
+            candidates = []
             
             for tweet in tweets:
                 tweet_id = tweet['id']
                 
-                tweet_created_at = datetime.strptime(tweet['created_at'], '%a %b %d %H:%M:%S %z %Y')
+                tweet_created_at = parse_twitter_timestamp(tweet['created_at'])
                 if tweet_created_at < self.start_time:
                     print(f"Skipping tweet {tweet_id} because it was created before the interaction handler was initialized")
                     continue
@@ -128,53 +315,52 @@ class TwitterInteractionHandler:
                 if self.has_responded_to_tweet(tweet_id):
                     print(f"Already responded to tweet {tweet_id}")
                     continue
-                
+                candidates.append(tweet)
 
-                                
-                print(f"Processing tweet {tweet_id} from @{tweet['username']}")
-                tweetContent = tweet['text']
-                print("TWEET CONTENT: ", tweetContent)
-                tweetPrompt = getTweetResponsePrompt(tweetContent, tweet['username'], searchContext=searchContext)
-                if self.getUserContext : 
-                    userContext = self.getUserContext(self.chroma_client, tweet['username'])
-                    respondContext = additionalContext + userContext
-                else : 
-                    respondContext = additionalContext
-
-                # Generate and send response
-                response_text = self.generate_response(tweetPrompt, additionalContext=respondContext)
-                print("RESPONSE TEXT: ", response_text)
-                nResponses += 1
-                response = self.client.send_tweet(response_text, tweet_id)
-
-                interaction = f"""
-                You had the following interaction with {tweet['username']} 
-                {tweet['username']} tweeted : {tweetContent}
-
-                You responded with : {response_text}
-                """
-
-                if self.updateUserContext : 
-                    self.updateUserContext(self.chroma_client, tweet['username'], interaction, tweet['username'], additionalContext=additionalContext)
-                
-                # TO DO -> get actual 
-                responseId = "PLACEHOLDER"
-                ### Log Response to Chroma DB
-                self.log_response(original_tweet_id=tweet_id, response_tweet_id=responseId, tweet_content=tweetContent, response_text=response_text)
-                # Wait a bit between responses to avoid rate limiting
-                if nResponses >= maxReplies:
-                    break                
+            if not candidates:
+                return
+
+            # Each tweet's pipeline (context, LLM, send, user context update) is independent,
+            # so overlap them; reply_slots caps how many replies actually get sent
+            reply_slots = ReplyBudget(maxReplies)
+            # Separate pool for the context lookups so reply workers never wait on their own pool
+            with ThreadPoolExecutor(max_workers=2 * REPLY_WORKERS) as ctx_pool, \
+                 ThreadPoolExecutor(max_workers=min(REPLY_WORKERS, len(candidates))) as executor:
+                futures = [
+                    executor.submit(self._process_tweet, tweet, reply_slots, ctx_pool, additionalContext, searchContext)
+                    for tweet in candidates
+                ]
+                for future in as_completed(futures):
+                    try:
+                        if future.result():
+                            nResponses += 1
+                    except Exception as e:
+                        print(f"Error responding to tweet: {str(e)}")
+                    if nResponses >= maxReplies:
+                        for pending in futures:
+                            pending.cancel()
+                        break
 
         except Exception as e:
             print(f"Error checking mentions: {str(e)}")
+        finally:
+            self.flush_log()
 
     def monitor_mentions(self, check_interval: int = 120, additionalContext: str = ""):
         """Start monitoring mentions at regular intervals"""
         print("Starting mention monitoring...")
         
         try:
-            for searchTerm in self.search_terms:
-                self.check_mentions(searchTerm, additionalContext=additionalContext)
+            # Searches are independent HTTP round-trips, so run them concurrently
+            # and only then process the results one term at a time
+            with ThreadPoolExecutor(max_workers=max(len(self.search_terms), 1)) as executor:
+                search_responses = list(executor.map(
+                    lambda searchTerm: self.client.search_tweets(searchTerm, max_tweets=20),
+                    self.search_terms
+                ))
+
+            for searchTerm, search_response in zip(self.search_terms, search_responses):
+                self.check_mentions(searchTerm, additionalContext=additionalContext, search_response=search_response)
 
             print("Finished mention monitoring loop")
 
@@ -184,9 +370,12 @@ class TwitterInteractionHandler:
     def tweet_to_followers(self, check_interval: int = 120, additionalContext: str = ""):
         print("Starting tweet to followers loop...")
         followers = self.client.get_followers(self.client.username)
+        if not followers:
+            print("No followers found.")
+            return
         
-        ### randomly select a follower and tweet to them
-        follower = random.choice(followers)
+        ### randomly select a follower (weighted by reach) and tweet to them
+        follower = random.choices(followers, weights=[follower_weight(f) for f in followers])[0]
         print("Follower : ", follower['username'])
         print("Description", follower['description'])
         
@@ -237,8 +426,8 @@ class TwitterInteractionHandler:
                 print("No reply targets available.")
                 return
             
-            # randomly select a reply target
-            reply_target = random.choice(self.reply_targets)
+            # randomly select a reply target, targets can set an optional "weight" (default 1)
+            reply_target = random.choices(self.reply_targets, weights=[t.get("weight", 1) for t in self.reply_targets])[0]
             reply_search = f"from:{reply_target['searchTerm']}"
             searchContext = reply_target["searchContext"]
             self.check_mentions(reply_search, additionalContext=additionalContext, searchContext=searchContext)